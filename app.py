@@ -9,8 +9,9 @@ from __future__ import annotations
 import json
 import os
 import re
-from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from collections import defaultdict
 
 import anyio
@@ -22,12 +23,16 @@ try:
 except ImportError:
     import uuid
     class SupaClient:
-        async def load_events(self): return []
+        async def load_events(self, since=None, use_cache=True): return []
         async def get_state_value(self, k, default): return default
+        async def get_state_values(self, keys): return {}
         async def set_state(self, k, v): return True
+        async def set_states(self, items): return True
         async def sync_current_date(self, default): return default
         def delete_event(self, eid): return None
         def upsert_event(self, rec): return None
+        def bulk_upsert_events(self, recs): return [None] * len(recs)
+        async def run_sync(self, fn): return await anyio.to_thread.run_sync(fn)
     HarptosDate = Dict[str, int]
     def generate_event_id(): return str(uuid.uuid4())
 
@@ -49,7 +54,7 @@ MONTHS: List[str] = [
     "Uktar, The Rotting",
     "Nightal, The Drawing Down",
 ]
-DAYS_PER_MONTH = 30
+MONTH_INDEX: Dict[str, int] = {name: i for i, name in enumerate(MONTHS, start=1)}
 FESTIVALS: Dict[int, str] = {
     1: "Midwinter",
     4: "Greengrass",
@@ -58,32 +63,26 @@ FESTIVALS: Dict[int, str] = {
     11: "Feast of the Moon",
 }
 DEFAULT_CURRENT: HarptosDate = {"year": 1492, "month": 1, "day": 1}
+AUTO_TICK_SECONDS = 600
+
+# Moon phases keyed by kind ("new"/"full") -> {(month, day), ...}
+MoonMarkers = Dict[str, FrozenSet[Tuple[int, int]]]
+EMPTY_MARKERS: MoonMarkers = {"new": frozenset(), "full": frozenset()}
 
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "www")
 
+# Session notes parsing
+_EVENT_OPEN_RE = re.compile(r"^\s*\[event\]\s*$", re.IGNORECASE)
+_EVENT_CLOSE_RE = re.compile(r"^\s*\[/event\]\s*$", re.IGNORECASE)
+_TITLE_RE = re.compile(r"^\s*title\s*:\s*(.*)$", re.IGNORECASE)
+_NOTES_RE = re.compile(r"^\s*notes\s*:\s*(.*)$", re.IGNORECASE)
+_KV_RE = re.compile(r"^\s*([A-Za-z _-]+)\s*:\s*(.*?)\s*$")
+_PRIORITY_RE = re.compile(r"#\s*(\d+)\b")
+
 # ------------------------------------------------------------------------------
-# Injected CSS & JS
+# Injected JS
 # ------------------------------------------------------------------------------
 
-CUSTOM_CSS = """
-/* Glass / UI Fixes */
-.glass {
-    background: rgba(20, 20, 30, 0.85);
-    backdrop-filter: blur(10px);
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    border-radius: 8px;
-    color: #e0e0e0;
-}
-.day-tile-btn {
-    background: none; border: none; padding: 0; margin: 0;
-    width: 100%; text-align: left; cursor: pointer;
-}
-.day-tile-btn:hover .day-tile {
-    background: rgba(255, 255, 255, 0.1);
-}
-.pip-wrap { font-size: 0.7rem; color: #ffd700; margin-left: 4px; }
-"""
-
 CUSTOM_JS = """
 (function () {
   if (window.__harptosUiBound) return;
@@ -366,67 +365,130 @@ CUSTOM_JS = """
 # Logic Helpers
 # ------------------------------------------------------------------------------
 
-def load_markers() -> Dict[str, List[Dict[str, int]]]:
-    """Load moon phases from JSON."""
-    src = os.path.join(ASSETS_DIR, "moon_markers.json")
-    if os.path.exists(src):
-        try:
-            with open(src, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                return {"new": list(data.get("new", [])), "full": list(data.get("full", []))}
-        except Exception as e:
-            print("[App] moon_markers.json load failed:", repr(e))
-    return {"new": [], "full": []}
+MARKERS_PATH = os.path.join(ASSETS_DIR, "moon_markers.json")
+
+@lru_cache(maxsize=1)
+def _parse_markers(mtime: float) -> MoonMarkers:
+    """Parse moon_markers.json; `mtime` only keys the cache."""
+    try:
+        with open(MARKERS_PATH, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return {
+            kind: frozenset((int(x["month"]), int(x["day"])) for x in data.get(kind, []))
+            for kind in ("new", "full")
+        }
+    except Exception as e:
+        print("[App] moon_markers.json load failed:", repr(e))
+    return EMPTY_MARKERS
+
+def load_markers() -> MoonMarkers:
+    """Load moon phases from JSON, re-parsing only when the file changes."""
+    try:
+        mtime = os.stat(MARKERS_PATH).st_mtime
+    except OSError:
+        return EMPTY_MARKERS
+    return _parse_markers(mtime)
+
+_MONTH_NAMES: Tuple[str, ...] = tuple(MONTHS)
+_MONTH_SHORTS: Tuple[str, ...] = tuple(label.split(",")[0].strip() for label in MONTHS)
+_MONTH_NORM_MAP: Dict[str, int] = {
+    **{full.lower().strip(): i for i, full in enumerate(_MONTH_NAMES, start=1)},
+    **{short.lower(): i for i, short in enumerate(_MONTH_SHORTS, start=1)},
+}
 
 def month_name(i: int) -> str:
-    return MONTHS[i - 1] if 1 <= i <= 12 else MONTHS[0]
+    return _MONTH_NAMES[i - 1] if 1 <= i <= 12 else _MONTH_NAMES[0]
 
 def month_short(i: int) -> str:
-    return month_name(i).split(",")[0].strip()
+    return _MONTH_SHORTS[i - 1] if 1 <= i <= 12 else _MONTH_SHORTS[0]
 
-def ordinal_suffix(n: int) -> str:
+def _ordinal(n: int) -> str:
     if 10 <= (n % 100) <= 20:
         suf = "th"
     else:
         suf = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
     return f"{n}{suf}"
 
+# Harptos days are always 1..31, so the common case is a table lookup.
+_ORDINALS: Tuple[str, ...] = tuple(_ordinal(n) for n in range(32))
+
+def ordinal_suffix(n: int) -> str:
+    return _ORDINALS[n] if 0 <= n < 32 else _ordinal(n)
+
+def seconds_until_midnight(now: datetime) -> float:
+    """Seconds from `now` until the next local midnight."""
+    return (datetime.combine(now.date() + timedelta(days=1), time.min) - now).total_seconds()
+
 def _iso(d: Optional[date]) -> Optional[str]:
     return d.isoformat() if d else None
 
+# Indexed by month number 0..12.
+_FESTIVALS_BEFORE: Tuple[int, ...] = tuple(sum(1 for fm in FESTIVALS if fm < m) for m in range(13))
+_MAX_DAY: Tuple[int, ...] = tuple(31 if m in FESTIVALS else 30 for m in range(13))
+# Day numbers shown in each month's grid, festival 31st included.
+_MONTH_DAYS: Tuple[Tuple[int, ...], ...] = tuple(tuple(range(1, n + 1)) for n in _MAX_DAY)
+
 def festivals_before(month: int) -> int:
-    return sum(1 for m in FESTIVALS if m < month)
+    return _FESTIVALS_BEFORE[max(0, min(12, month))]
 
 def harptos_ordinal(y: int, m: int, d: int) -> int:
-    """Absolute day index."""
+    """Absolute day index of a sanitized date."""
     base = y * 365
-    before = (m - 1) * 30 + festivals_before(m)
-    day_index = before + (30 if (d == 31 and m in FESTIVALS) else d - 1)
+    before = (m - 1) * 30 + _FESTIVALS_BEFORE[m]
+    day_index = before + (30 if (d == 31 and _MAX_DAY[m] == 31) else d - 1)
     return base + day_index
 
 def _priority_from_title(title: str) -> int:
-    if not title:
+    if not title or "#" not in title:
         return 10_000_000
-    m = re.search(r'#\s*(\d+)\b', title)
+    m = _PRIORITY_RE.search(title)
     return int(m.group(1)) if m else 10_000_000
 
-def advance_one(h: HarptosDate) -> HarptosDate:
-    y, m, d = h["year"], h["month"], h["day"]
-    if d == 31:
-        m2 = 1 if m == 12 else m + 1
-        return {"year": y + (m == 12), "month": m2, "day": 1}
-    if 1 <= d < 30:
-        return {"year": y, "month": m, "day": d + 1}
-    if d == 30:
-        return {"year": y, "month": m, "day": 31} if m in FESTIVALS else {
-            "year": y + (m == 12), "month": 1 if m == 12 else m + 1, "day": 1
-        }
-    return {"year": y, "month": 1, "day": 1}
+def normalize_event_row(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a raw events row in place to the shape the UI relies on."""
+    hd = sanitize_harptos_date(
+        int(r.get("year", DEFAULT_CURRENT["year"])),
+        int(r.get("month", DEFAULT_CURRENT["month"])),
+        int(r.get("day", DEFAULT_CURRENT["day"])),
+    )
+    r["year"] = hd["year"]
+    r["month"] = hd["month"]
+    r["day"] = hd["day"]
+    r["title"] = str(r.get("title") or "")
+    r["_title_lower"] = r["title"].lower()
+    r["_label"] = (r["title"] or "(Untitled)").strip()
+    r["notes"] = str(r.get("notes") or "")
+    r["id"] = str(r.get("id"))
+    return r
+
+def timeline_sort_key(r: Dict[str, Any]) -> Tuple[int, int, str, str]:
+    """Sort key for normalized event rows (see reload_events)."""
+    return (
+        harptos_ordinal(r["year"], r["month"], r["day"]),
+        _priority_from_title(r["title"]),
+        r["_title_lower"],
+        r["id"],
+    )
+
+# Day-of-year slot (0..364) -> (month, day); inverse of the harptos_ordinal offset.
+_YEAR_SLOTS: Tuple[Tuple[int, int], ...] = tuple(
+    (m, d) for m in range(1, 13) for d in _MONTH_DAYS[m]
+)
+
+def harptos_from_ordinal(n: int) -> HarptosDate:
+    y, slot = divmod(n, 365)
+    m, d = _YEAR_SLOTS[slot]
+    return {"year": y, "month": m, "day": d}
+
+def advance_days(h: HarptosDate, days: int) -> HarptosDate:
+    """Move `days` days forward through the 365-day year, festival days included."""
+    if days <= 0:
+        return h
+    return harptos_from_ordinal(harptos_ordinal(h["year"], h["month"], h["day"]) + days)
 
 def sanitize_harptos_date(y: int, m: int, d: int) -> HarptosDate:
     m = max(1, min(12, int(m)))
-    max_day = 31 if m in FESTIVALS else 30
-    d = max(1, min(max_day, int(d)))
+    d = max(1, min(_MAX_DAY[m], int(d)))
     return {"year": int(y), "month": m, "day": d}
 
 def parse_month_value(raw: str) -> Optional[int]:
@@ -437,33 +499,24 @@ def parse_month_value(raw: str) -> Optional[int]:
         m = int(v)
         return m if 1 <= m <= 12 else None
 
-    norm = v.lower()
-    for i, label in enumerate(MONTHS, start=1):
-        full = label.lower().strip()
-        short = label.split(",")[0].strip().lower()
-        if norm in (full, short):
-            return i
-    return None
+    return _MONTH_NORM_MAP.get(v.lower())
 
 def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]]:
-    blocks: List[str] = []
-    cur_lines: List[str] = []
-    in_block = False
-    for raw_line in (text or "").splitlines():
-        if re.match(r"^\s*\[event\]\s*$", raw_line, flags=re.IGNORECASE):
-            if in_block and cur_lines:
-                blocks.append("\n".join(cur_lines))
-            in_block = True
-            cur_lines = []
+    # Blocks are (start, end) index ranges into `lines`; start is -1 outside a block.
+    lines = (text or "").splitlines()
+    blocks: List[Tuple[int, int]] = []
+    start = -1
+    for i, raw_line in enumerate(lines):
+        is_marker = "[" in raw_line
+        if is_marker and _EVENT_OPEN_RE.match(raw_line):
+            if start >= 0 and i > start:
+                blocks.append((start, i))
+            start = i + 1
             continue
-        if re.match(r"^\s*\[/event\]\s*$", raw_line, flags=re.IGNORECASE):
-            if in_block:
-                blocks.append("\n".join(cur_lines))
-            in_block = False
-            cur_lines = []
-            continue
-        if in_block:
-            cur_lines.append(raw_line)
+        if is_marker and _EVENT_CLOSE_RE.match(raw_line):
+            if start >= 0:
+                blocks.append((start, i))
+            start = -1
 
     if not blocks:
         return [], ["No [Event]...[/Event] blocks found."]
@@ -471,7 +524,7 @@ def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]
     parsed: List[Dict[str, Any]] = []
     errors: List[str] = []
 
-    for idx, block in enumerate(blocks, start=1):
+    for idx, (start, end) in enumerate(blocks, start=1):
         base_year = DEFAULT_CURRENT["year"]
         base_month = DEFAULT_CURRENT["month"]
         base_day = DEFAULT_CURRENT["day"]
@@ -496,10 +549,12 @@ def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]
             )
             cur_item = None
 
-        for raw_line in block.splitlines():
+        for raw_line in lines[start:end]:
             line = raw_line.rstrip("\r")
+            # Every field line needs a colon; skip the regexes for plain prose.
+            has_colon = ":" in line
 
-            title_match = re.match(r"^\s*title\s*:\s*(.*)$", line, flags=re.IGNORECASE)
+            title_match = _TITLE_RE.match(line) if has_colon else None
             if title_match:
                 _finish_item()
                 cur_item = {
@@ -510,7 +565,7 @@ def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]
                 reading_notes = False
                 continue
 
-            notes_match = re.match(r"^\s*notes\s*:\s*(.*)$", line, flags=re.IGNORECASE)
+            notes_match = _NOTES_RE.match(line) if has_colon else None
             if notes_match:
                 if cur_item is None:
                     cur_item = {"title": "(Untitled)", "notes_lines": [], "real_world_date": base_real_world_date}
@@ -526,7 +581,9 @@ def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]
                 cur_item["notes_lines"].append(line)
                 continue
 
-            kv = re.match(r"^\s*([A-Za-z _-]+)\s*:\s*(.*?)\s*$", line)
+            if not has_colon:
+                continue
+            kv = _KV_RE.match(line)
             if not kv:
                 continue
             key = kv.group(1).strip().lower().replace("-", "_").replace(" ", "_")
@@ -589,9 +646,9 @@ def parse_session_notes_text(text: str) -> Tuple[List[Dict[str, Any]], List[str]
 # UI Components
 # ------------------------------------------------------------------------------
 
-def pip_for_day(m: int, d: int, ms: Dict[str, List[Dict[str, int]]]) -> Optional[ui.TagChild]:
-    has_new = any(x["month"] == m and x["day"] == d for x in ms.get("new", []))
-    has_full = any(x["month"] == m and x["day"] == d for x in ms.get("full", []))
+def pip_for_day(m: int, d: int, ms: MoonMarkers) -> Optional[ui.TagChild]:
+    has_new = (m, d) in ms["new"]
+    has_full = (m, d) in ms["full"]
     if not (has_new or has_full):
         return None
     dots = []
@@ -605,14 +662,14 @@ def event_blurbs(events_list: List[Dict[str, Any]]) -> ui.TagChild:
     items: List[ui.TagChild] = []
     max_items = 4
     for e in events_list[:max_items]:
-        items.append(ui.div((e.get("title") or "(Untitled)").strip(), class_="event-blurb"))
+        items.append(ui.div(e["_label"], class_="event-blurb"))
     if len(events_list) > max_items:
         items.append(ui.div(f"+{len(events_list) - max_items} more", class_="event-more"))
     return ui.div(*items, class_="day-events")
 
 def day_tile_button(y: int, m: int, d: int, highlight: bool, 
                     day_events: List[Dict[str, Any]], 
-                    markers_data: Dict[str, List]) -> ui.TagChild:
+                    markers_data: MoonMarkers) -> ui.TagChild:
     tile_class = "day-tile current-day" if highlight else "day-tile"
     
     day_label = str(d)
@@ -638,34 +695,28 @@ def day_tile_button(y: int, m: int, d: int, highlight: bool,
 
 def month_card(m: int, cur: Optional[HarptosDate], 
                indexed_events: Dict[Tuple[int, int, int], List[Dict[str, Any]]], 
-               markers_data: Dict[str, List]) -> ui.TagChild:
+               markers_data: MoonMarkers) -> ui.TagChild:
     view_year = (cur or {"year": 1492})["year"]
-    is_hl = lambda d: bool(cur and cur["month"] == m and cur["day"] == d)
+    hl_day = cur["day"] if (cur and cur["month"] == m) else -1
     
-    tiles: List[ui.TagChild] = []
+    tiles = ui.TagList()
     
-    # 1-30 Days
-    for d in range(1, DAYS_PER_MONTH + 1):
+    # 1-30, plus the festival 31st where there is one
+    for d in _MONTH_DAYS[m]:
         d_evs = indexed_events.get((view_year, m, d), [])
-        tiles.append(day_tile_button(view_year, m, d, is_hl(d), d_evs, markers_data))
-        
-    # Festival Day (31st)
-    if m in FESTIVALS:
-        d_evs = indexed_events.get((view_year, m, 31), [])
-        tiles.append(day_tile_button(view_year, m, 31, is_hl(31), d_evs, markers_data))
-        
+        tiles.append(day_tile_button(view_year, m, d, d == hl_day, d_evs, markers_data))
+    
     return ui.card(
         ui.card_header(f"{month_name(m)} {view_year}"),
-        ui.div(*tiles, class_="month-grid"),
+        ui.div(tiles, class_="month-grid"),
         class_="month-card glass",
     )
 
 def timeline_card(event: Dict[str, Any]) -> ui.TagChild:
-    y = int(event.get("year", 1492))
-    m = int(event.get("month", 1))
-    d = int(event.get("day", 1))
-    eid = str(event.get("id"))
-    title = (event.get("title") or "(Untitled)").strip()
+    # year/month/day are ints already (normalized in reload_events)
+    y, m, d = event["year"], event["month"], event["day"]
+    eid = event["id"]
+    title = event["_label"]
     sub = f"{ordinal_suffix(d)} of {month_short(m)}, {y}"
     desc = (event.get("notes") or "").strip() or "No notes recorded."
     rw = (event.get("real_world_date") or "").strip()
@@ -700,7 +751,6 @@ bg_overlay = ui.div(id="bg-overlay")
 page = ui.page_fluid(
     ui.head_content(
         ui.tags.link(rel="stylesheet", href="styles.css"),
-        ui.tags.style(CUSTOM_CSS),
         ui.tags.script(CUSTOM_JS),
     ),
     bg_video,
@@ -784,37 +834,96 @@ def server(input, output, session):
     # State
     current: reactive.Value[Optional[HarptosDate]] = reactive.Value(None)
     events: reactive.Value[List[Dict[str, Any]]] = reactive.Value([])
-    markers: reactive.Value[Dict[str, List[Dict[str, Any]]]] = reactive.Value({"new": [], "full": []})
+    markers: reactive.Value[MoonMarkers] = reactive.Value(EMPTY_MARKERS)
     
     selected_date: reactive.Value[Optional[HarptosDate]] = reactive.Value(None)
     selected_event_id: reactive.Value[Optional[str]] = reactive.Value(None)
 
     def set_current_and_controls(h: HarptosDate) -> None:
+        # Unchanged ticks must not invalidate the calendar or resend controls.
+        with reactive.isolate():
+            if current.get() == h:
+                return
         current.set(h)
         ui.update_select("set_month", selected=month_name(h["month"]))
         ui.update_numeric("set_day", value=h["day"])
         ui.update_numeric("set_year", value=h["year"])
 
-    async def reload_events():
-        rows = await db.load_events()
+    # Newest updated_at seen so far; lets saves/imports fetch only changed rows.
+    events_synced_at: Optional[str] = None
+
+    async def reload_events(full: bool = True, use_cache: bool = True):
+        """Refresh events from Supabase.
+
+        full=False fetches only rows touched since the last sync and merges
+        them by id. It cannot see rows deleted by other sessions, so the
+        initial load and the Refresh button always do a full reload; the
+        Refresh button also bypasses the shared events cache.
+        """
+        nonlocal events_synced_at
+        since = None if full else events_synced_at
+        rows = await db.load_events(since=since, use_cache=use_cache)
         norm: List[Dict[str, Any]] = []
         for r in rows or []:
             try:
-                hd = sanitize_harptos_date(
-                    int(r.get("year", DEFAULT_CURRENT["year"])),
-                    int(r.get("month", DEFAULT_CURRENT["month"])),
-                    int(r.get("day", DEFAULT_CURRENT["day"])),
-                )
-                r["year"] = hd["year"]
-                r["month"] = hd["month"]
-                r["day"] = hd["day"]
-                r["title"] = str(r.get("title") or "")
-                r["notes"] = str(r.get("notes") or "")
-                r["id"] = str(r.get("id"))
+                norm.append(normalize_event_row(r))
             except Exception:
                 continue
-            norm.append(r)
-        events.set(norm)
+
+        stamps = [str(r["updated_at"]) for r in norm if r.get("updated_at")]
+        if stamps:
+            latest = max(stamps)
+            events_synced_at = latest if since is None else max(since, latest)
+        elif since is None:
+            events_synced_at = None
+
+        # reactive.Value.set only compares by identity; skip equal data so
+        # a no-op refresh does not rebuild the calendar and timeline.
+        with reactive.isolate():
+            prev = events.get()
+        if since is None:
+            if norm != prev:
+                events.set(norm)
+            return
+        merged = {e["id"]: e for e in prev}
+        changed = [r for r in norm if merged.get(r["id"]) != r]
+        if not changed:
+            return
+        merged.update((r["id"], r) for r in changed)
+        events.set(list(merged.values()))
+
+    def drop_event_locally(eid: str) -> None:
+        with reactive.isolate():
+            events.set([e for e in events.get() if e["id"] != eid])
+
+    def put_event_locally(rec: Dict[str, Any]) -> None:
+        """Write-through of a record that was just persisted; saves a refetch."""
+        row = normalize_event_row(dict(rec))
+        with reactive.isolate():
+            rows = [e for e in events.get() if e["id"] != row["id"]]
+        rows.append(row)
+        events.set(rows)
+
+    @reactive.Calc
+    def events_by_date() -> Dict[Tuple[int, int, int], List[Dict[str, Any]]]:
+        indexed: Dict[Tuple[int, int, int], List[Dict[str, Any]]] = defaultdict(list)
+        for e in events.get():
+            indexed[(e["year"], e["month"], e["day"])].append(e)
+        return indexed
+
+    @reactive.Calc
+    def events_by_id() -> Dict[str, Dict[str, Any]]:
+        return {e["id"]: e for e in events.get()}
+
+    # Last card built per month, with the events index and markers it came
+    # from. A plain per-session dict rather than a Calc: build_calendar_ui
+    # writes into it, and a source mismatch is caught by identity below, so
+    # no clearing effect has to run before the render does.
+    month_cards: Dict[int, Tuple[Any, MoonMarkers, Tuple[int, int], ui.TagChild]] = {}
+
+    @reactive.Calc
+    def sorted_events() -> List[Dict[str, Any]]:
+        return sorted(events.get() or [], key=timeline_sort_key)
 
     async def sync_global_current_date() -> None:
         synced = await db.sync_current_date(DEFAULT_CURRENT)
@@ -827,7 +936,8 @@ def server(input, output, session):
             set_current_and_controls(h)
             return
 
-        st = await db.get_state_value("current_date", default=DEFAULT_CURRENT)
+        states = await db.get_state_values(["current_date", "last_checked"])
+        st = states.get("current_date")
         if isinstance(st, dict):
             try:
                 h = sanitize_harptos_date(int(st["year"]), int(st["month"]), int(st["day"]))
@@ -837,29 +947,42 @@ def server(input, output, session):
             h = dict(DEFAULT_CURRENT)
 
         today = date.today()
-        raw_last = await db.get_state_value("last_checked", default=today.isoformat())
+        raw_last = states.get("last_checked")
         try:
-            last = date.fromisoformat(raw_last) if isinstance(raw_last, str) else today
+            last: Optional[date] = date.fromisoformat(raw_last) if isinstance(raw_last, str) else None
         except Exception:
-            last = today
+            last = None
 
-        days_elapsed = max(0, (today - last).days)
-        for _ in range(days_elapsed):
-            h = advance_one(h)
+        days_elapsed = max(0, (today - last).days) if last else 0
+        h = advance_days(h, days_elapsed)
 
         set_current_and_controls(h)
-        await db.set_state("current_date", h)
-        await db.set_state("last_checked", today.isoformat())
+        # Only write back what actually changed (or was never stored).
+        updates: Dict[str, Any] = {}
+        if h != st:
+            updates["current_date"] = h
+        if last != today:
+            updates["last_checked"] = today.isoformat()
+        if updates:
+            await db.set_states(updates)
 
     @reactive.Effect
     async def _init():
-        markers.set(load_markers())
-        await sync_global_current_date()
-        await reload_events()
+        # The date sync, events fetch and markers file are independent.
+        async def _load_markers() -> None:
+            markers.set(await anyio.to_thread.run_sync(load_markers))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(_load_markers)
+            tg.start_soon(sync_global_current_date)
+            tg.start_soon(reload_events)
 
     @reactive.Effect
     async def _auto_tick():
-        reactive.invalidate_later(600_000)
+        # invalidate_later takes seconds. Keep the 10-minute cadence (so date
+        # changes saved by other sessions show up) but wake right after local
+        # midnight so the day rolls over on time.
+        reactive.invalidate_later(min(AUTO_TICK_SECONDS, seconds_until_midnight(datetime.now()) + 1))
         await sync_global_current_date()
 
     @render.text
@@ -870,33 +993,30 @@ def server(input, output, session):
     # ---- View Builders -------------------------------------------------------
 
     def build_calendar_ui() -> ui.TagChild:
-        ev_data = events.get()
         h = current.get()
         ms = markers.get()
-        
-        # Performance: Index events by date immediately
-        # Dict[Tuple[year, month, day], List[Event]]
-        indexed = defaultdict(list)
-        for e in ev_data:
-            key = (int(e["year"]), int(e["month"]), int(e["day"]))
-            indexed[key].append(e)
-            
-        return ui.div(*[month_card(m, h, indexed, ms) for m in range(1, 13)], class_="months-wrap")
+        indexed = events_by_date()
+        view_year = (h or DEFAULT_CURRENT)["year"]
+
+        # Moving the current date only changes the highlight in (at most) two
+        # months; every other card is reused as-is.
+        cards = ui.TagList()
+        for m in range(1, 13):
+            key = (view_year, h["day"] if (h and h["month"] == m) else -1)
+            hit = month_cards.get(m)
+            if hit is not None and hit[0] is indexed and hit[1] is ms and hit[2] == key:
+                card = hit[3]
+            else:
+                card = month_card(m, h, indexed, ms)
+                month_cards[m] = (indexed, ms, key, card)
+            cards.append(card)
+        return ui.div(cards, class_="months-wrap")
 
     def build_timeline_ui() -> ui.TagChild:
-        rows = events.get() or []
-        if not rows:
+        rows_sorted = sorted_events()
+        if not rows_sorted:
             return ui.div(ui.p("No events yet.", class_="text-center mt-4"), class_="glass p-3")
 
-        rows_sorted = sorted(
-            rows,
-            key=lambda r: (
-                harptos_ordinal(int(r["year"]), int(r["month"]), int(r["day"])),
-                _priority_from_title(r["title"]),
-                r["title"].lower(),
-                r["id"]
-            )
-        )
         query_raw = ""
         search_val = input.timeline_search
         if search_val.is_set():
@@ -905,7 +1025,7 @@ def server(input, output, session):
             except Exception:
                 query_raw = ""
         query = query_raw.casefold()
-        cards = [timeline_card(r) for r in rows_sorted]
+        cards = ui.TagList(*(timeline_card(r) for r in rows_sorted))
 
         best_idx: Optional[int] = None
         best_score = -1
@@ -913,9 +1033,7 @@ def server(input, output, session):
 
         if query:
             for idx, row in enumerate(rows_sorted):
-                y = int(row.get("year", DEFAULT_CURRENT["year"]))
-                m = int(row.get("month", DEFAULT_CURRENT["month"]))
-                d = int(row.get("day", DEFAULT_CURRENT["day"]))
+                y, m, d = row["year"], row["month"], row["day"]
 
                 title = str(row.get("title") or "")
                 notes = str(row.get("notes") or "")
@@ -955,10 +1073,8 @@ def server(input, output, session):
 
         if query_raw and best_idx is not None:
             match = rows_sorted[best_idx]
-            my = int(match.get("year", DEFAULT_CURRENT["year"]))
-            mm = int(match.get("month", DEFAULT_CURRENT["month"]))
-            md = int(match.get("day", DEFAULT_CURRENT["day"]))
-            mt = (match.get("title") or "(Untitled)").strip()
+            my, mm, md = match["year"], match["month"], match["day"]
+            mt = match["_label"]
             search_meta_text = f"Best match: {month_short(mm)} {md}, {my} - {mt} (card {best_idx + 1} of {len(rows_sorted)})"
         elif query_raw:
             search_meta_text = f"No match for '{query_raw}'. Showing all {len(rows_sorted)} cards."
@@ -975,7 +1091,7 @@ def server(input, output, session):
         stage = ui.div(
             ui.tags.button("<", class_="tl-arrow tl-arrow-prev", **{"type": "button", "aria-label": "Previous"}),
             ui.div(
-                ui.div(*cards, class_="tl-carousel-track"),
+                ui.div(cards, class_="tl-carousel-track"),
                 class_="tl-carousel-viewport",
             ),
             ui.tags.button(">", class_="tl-arrow tl-arrow-next", **{"type": "button", "aria-label": "Next"}),
@@ -1011,27 +1127,26 @@ def server(input, output, session):
             selected_event_id.set(None)
             
             # Show the modal list (REPLACES existing if open)
-            ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events.get()))
+            ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events_by_date()))
         except Exception as e:
             print(f"Click error: {e}")
 
     @reactive.Effect
     @reactive.event(input.edit_event_clicked)
-    async def _on_edit_click():
+    def _on_edit_click():
         payload = input.edit_event_clicked()
         eid = payload.get("id") if isinstance(payload, dict) else payload
         if not eid: return
 
-        all_events = events.get() or []
-        ev = next((e for e in all_events if str(e["id"]) == str(eid)), None)
+        ev = events_by_id().get(str(eid))
         if not ev:
             ui.notification_show("Event not found.", type="warning")
             return
         
-        hd = sanitize_harptos_date(int(ev["year"]), int(ev["month"]), int(ev["day"]))
-        y, m, d = hd["year"], hd["month"], hd["day"]
+        y, m, d = ev["year"], ev["month"], ev["day"]
+        hd: HarptosDate = {"year": y, "month": m, "day": d}
         selected_date.set(hd)
-        selected_event_id.set(str(ev["id"]))
+        selected_event_id.set(ev["id"])
         
         rw_date = None
         raw_rw = ev.get("real_world_date")
@@ -1041,15 +1156,14 @@ def server(input, output, session):
             except (ValueError, TypeError):
                 rw_date = None
 
-        # Fix: Remove old, wait for DOM cleanup, then show new
-        ui.modal_remove()
-        await anyio.sleep(0.2)
+        # modal_show swaps the content of an open modal in place; calling
+        # modal_remove first races its fade-out cleanup against the new modal.
         ui.modal_show(event_form_modal(
             y, m, d,
             title_val=ev.get("title", ""),
             notes_val=ev.get("notes", ""),
             rw_date=rw_date,
-            event_id=str(ev["id"])
+            event_id=ev["id"]
         ))
 
     # ---- Standard Controls ---------------------------------------------------
@@ -1057,8 +1171,7 @@ def server(input, output, session):
     @reactive.Effect
     @reactive.event(input.btn_apply_current)
     def _apply_current():
-        try: m = MONTHS.index(input.set_month()) + 1
-        except ValueError: m = 1
+        m = MONTH_INDEX.get(input.set_month(), 1)
         d = int(input.set_day() or 1)
         y = int(input.set_year() or 1492)
         current.set(sanitize_harptos_date(y, m, d))
@@ -1068,9 +1181,7 @@ def server(input, output, session):
     async def _save_current():
         h = current.get()
         if not h: return
-        ok = await db.set_state("current_date", h)
-        if ok:
-            ok = await db.set_state("last_checked", date.today().isoformat())
+        ok = await db.set_states({"current_date": h, "last_checked": date.today().isoformat()})
         if ok: ui.notification_show("Current date saved.", type="message")
         else: ui.notification_show("Failed saving date.", type="error")
 
@@ -1093,7 +1204,7 @@ def server(input, output, session):
     @reactive.Effect
     @reactive.event(input.btn_refresh_events)
     async def _refresh_handler():
-        await reload_events()
+        await reload_events(use_cache=False)
         ui.notification_show("Events refreshed.", type="message")
 
     @reactive.Effect
@@ -1117,33 +1228,35 @@ def server(input, output, session):
             ui.notification_show("Uploaded file path is unavailable.", type="error")
             return
 
-        try:
+        def _read_and_parse() -> Tuple[List[Dict[str, Any]], List[str]]:
             with open(datapath, "r", encoding="utf-8-sig", errors="replace") as fh:
                 text = fh.read()
+            return parse_session_notes_text(text)
+
+        try:
+            records, parse_errors = await anyio.to_thread.run_sync(_read_and_parse)
         except Exception as e:
             ui.notification_show(f"Could not read uploaded file: {e}", type="error", duration=8)
             return
 
-        records, parse_errors = parse_session_notes_text(text)
         if not records:
             detail = parse_errors[0] if parse_errors else "No valid events found."
             ui.notification_show(f"Import failed: {detail}", type="error", duration=8)
             return
 
-        imported = 0
-        failed = 0
-        first_error: Optional[str] = None
-        for rec in records:
-            try:
-                await anyio.to_thread.run_sync(lambda payload=dict(rec): db.upsert_event(payload))
-                imported += 1
-            except Exception as e:
-                failed += 1
-                if first_error is None:
-                    first_error = str(e)
+        payloads = [dict(rec) for rec in records]
+        try:
+            results = await db.run_sync(lambda: db.bulk_upsert_events(payloads))
+        except Exception as e:
+            results = [str(e)] * len(payloads)
+
+        errors = [err for err in results if err is not None]
+        failed = len(errors)
+        imported = len(results) - failed
+        first_error: Optional[str] = errors[0] if errors else None
 
         if imported:
-            await reload_events()
+            await reload_events(full=False)
 
         if failed:
             extra = f" First error: {first_error}" if first_error else ""
@@ -1169,24 +1282,19 @@ def server(input, output, session):
 
     @reactive.Effect
     @reactive.event(input.ev_add_new)
-    async def _add_new_from_list():
+    def _add_new_from_list():
         h = selected_date.get() or dict(DEFAULT_CURRENT)
         selected_event_id.set(None)
-        
-        # Fix: Transition logic
-        ui.modal_remove()
-        await anyio.sleep(0.2)
         ui.modal_show(event_form_modal(h["year"], h["month"], h["day"]))
 
     @reactive.Effect
     @reactive.event(input.ev_cancel)
-    async def _cancel_form():
+    def _cancel_form():
         h = selected_date.get()
-        # Fix: Transition logic
-        ui.modal_remove()
-        await anyio.sleep(0.2)
         if h:
-            ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events.get()))
+            ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events_by_date()))
+        else:
+            ui.modal_remove()
 
     @reactive.Effect
     @reactive.event(input.ev_delete)
@@ -1194,16 +1302,14 @@ def server(input, output, session):
         eid = selected_event_id.get()
         if not eid: return
         try:
-            await anyio.to_thread.run_sync(lambda: db.delete_event(eid))
-            await reload_events()
+            await db.run_sync(lambda: db.delete_event(eid))
+            drop_event_locally(eid)
             ui.notification_show("Event deleted.", type="message")
             h = selected_date.get()
-            
-            # Fix: Transition logic
-            ui.modal_remove()
-            await anyio.sleep(0.2)
             if h:
-                ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events.get()))
+                ui.modal_show(day_details_modal(h["year"], h["month"], h["day"], events_by_date()))
+            else:
+                ui.modal_remove()
         except Exception as e:
             ui.notification_show(f"Error: {e}", type="error")
 
@@ -1211,8 +1317,7 @@ def server(input, output, session):
     @reactive.event(input.ev_save)
     async def _save_event():
         try:
-            try: m = MONTHS.index(input.ev_month()) + 1
-            except ValueError: m = 1
+            m = MONTH_INDEX.get(input.ev_month(), 1)
             d = int(input.ev_day() or 1)
             y = int(input.ev_year() or 1492)
             h = sanitize_harptos_date(y, m, d)
@@ -1227,16 +1332,12 @@ def server(input, output, session):
                 "real_world_date": _iso(input.ev_real_date()),
             }
             
-            await anyio.to_thread.run_sync(lambda: db.upsert_event(rec))
-            await reload_events()
+            await db.run_sync(lambda: db.upsert_event(rec))
+            put_event_locally(rec)
             
             selected_date.set({"year": y, "month": m, "day": d})
             selected_event_id.set(None)
-            
-            # Fix: Transition logic
-            ui.modal_remove()
-            await anyio.sleep(0.2)
-            ui.modal_show(day_details_modal(y, m, d, events.get()))
+            ui.modal_show(day_details_modal(y, m, d, events_by_date()))
             ui.notification_show("Event saved.", type="message")
         except Exception as e:
             ui.notification_show(f"Error saving: {e}", type="error")
@@ -1245,14 +1346,9 @@ def server(input, output, session):
 # Modals
 # ------------------------------------------------------------------------------
 
-def day_details_modal(y: int, m: int, d: int, all_events: List[Dict[str, Any]]) -> ui.TagChild:
-    day_events: List[Dict[str, Any]] = []
-    for r in all_events or []:
-        try:
-            if int(r["year"]) == y and int(r["month"]) == m and int(r["day"]) == d:
-                day_events.append(r)
-        except Exception:
-            continue
+def day_details_modal(y: int, m: int, d: int,
+                      indexed_events: Dict[Tuple[int, int, int], List[Dict[str, Any]]]) -> ui.TagChild:
+    day_events = indexed_events.get((y, m, d), [])
     
     items: List[ui.TagChild] = []
     if not day_events:
@@ -1270,7 +1366,7 @@ def day_details_modal(y: int, m: int, d: int, all_events: List[Dict[str, Any]])
                         ui.tags.button(
                             "Edit",
                             class_="btn btn-link btn-sm edit-event-btn text-decoration-none",
-                            **{"type": "button", "data-edit-id": str(r["id"])}
+                            **{"type": "button", "data-edit-id": r["id"]}
                         ),
                         class_="d-flex align-items-center justify-content-between",
                     ),
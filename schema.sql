@@ -35,6 +35,33 @@ alter table public.events
 -- Helpful index for day lookups
 create index if not exists events_ymd_idx on public.events(year, month, day);
 
+-- Row change stamp so the app can fetch only events touched since its last sync.
+alter table public.events
+  add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists events_updated_at_idx on public.events(updated_at);
+
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists events_touch_updated_at on public.events;
+create trigger events_touch_updated_at
+  before update on public.events
+  for each row execute function public.touch_updated_at();
+
+-- Same for state rows, so upserts from the app need not send a timestamp.
+drop trigger if exists state_touch_updated_at on public.state;
+create trigger state_touch_updated_at
+  before update on public.state
+  for each row execute function public.touch_updated_at();
+
 -- Atomically advance global Harptos date based on elapsed real days.
 create or replace function public.advance_harptos_date_if_needed(
   default_year int,
@@ -3,17 +3,25 @@
 # Supabase wrapper for Harptos calendar
 # - UUID4 ids for events (Postgres UUID column)
 # - Async-safe helpers
+# - Short-lived process-wide cache of the full events table
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
 
-import json
+import logging
 import os
+import time
 import uuid
-from typing import Any, Dict, List, Optional, TypedDict
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict, TypeVar
 
 import anyio
-from supabase import create_client
+from postgrest.types import ReturnMethod
+from supabase import Client, create_client
+
+
+T = TypeVar("T")
 
 
 class HarptosDate(TypedDict):
@@ -22,6 +30,21 @@ class HarptosDate(TypedDict):
     day: int
 
 
+EVENTS_CACHE_TTL = 60.0  # seconds
+DATE_SYNC_TTL = 300.0  # seconds
+EVENTS_UPSERT_BATCH = 100  # rows per bulk upsert request
+DB_THREADS = 16  # worker threads reserved for Supabase calls
+
+
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4)
+def _get_client(url: str, key: str) -> Client:
+    """One supabase client per credential pair, reused by every SupaClient."""
+    return create_client(url, key)
+
+
 def generate_event_id() -> str:
     """Return a UUID4 string for the events.id (UUID) column."""
     return str(uuid.uuid4())
@@ -30,13 +53,32 @@ def generate_event_id() -> str:
 class SupaClient:
     state_table: str = "state"
     events_table: str = "events"
+    # (fetched_at, rows) for the last full load_events(), shared by every
+    # session in this process; dropped on any write made through SupaClient.
+    # The generation counter stops a load that raced a write from caching.
+    _events_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+    _events_gen: int = 0
+    _events_lock: Optional[anyio.Lock] = None
+    # (synced_at, local day, result) of the last advance RPC. Sessions that
+    # tick together (e.g. at midnight) queue on the lock and share one call.
+    _date_sync: Optional[Tuple[float, str, HarptosDate]] = None
+    _date_sync_lock: Optional[anyio.Lock] = None
+    # Supabase calls get their own thread budget so they never queue behind
+    # other to_thread work (file reads, imports) on anyio's default limiter.
+    _db_limiter: Optional[anyio.CapacityLimiter] = None
 
     def __init__(self) -> None:
         url = os.environ.get("SUPABASE_URL")
         key = os.environ.get("SUPABASE_ANON_KEY")
         if not url or not key:
             raise RuntimeError("Missing SUPABASE_URL / SUPABASE_ANON_KEY")
-        self.client = create_client(url, key)
+        self.client = _get_client(url, key)
+
+    async def run_sync(self, fn: Callable[[], T]) -> T:
+        """Run a blocking Supabase call in a worker thread from the DB pool."""
+        if SupaClient._db_limiter is None:
+            SupaClient._db_limiter = anyio.CapacityLimiter(DB_THREADS)
+        return await anyio.to_thread.run_sync(fn, limiter=SupaClient._db_limiter)
 
     # -------- state -----------------------------------------------------------
 
@@ -44,67 +86,138 @@ class SupaClient:
         def _q():
             return self.client.table(self.state_table).select("value").eq("key", key).limit(1).execute()
         try:
-            res = await anyio.to_thread.run_sync(_q)
+            res = await self.run_sync(_q)
             rows = getattr(res, "data", None) or []
             if rows:
                 return rows[0].get("value", default)
             return default
         except Exception as e:
-            print("[Supa] get_state_value failed:", repr(e))
+            log.warning("get_state_value failed: %r", e)
             return default
 
+    async def get_state_values(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch several state keys in one query; missing keys are left out."""
+        def _q():
+            return self.client.table(self.state_table).select("key,value").in_("key", keys).execute()
+        try:
+            res = await self.run_sync(_q)
+            rows = getattr(res, "data", None) or []
+            return {r["key"]: r.get("value") for r in rows if "key" in r}
+        except Exception as e:
+            log.warning("get_state_values failed: %r", e)
+            return {}
+
     async def set_state(self, key: str, value: Any) -> bool:
         rec = {"key": key, "value": value}
         def _q():
-            return self.client.table(self.state_table).upsert(rec, on_conflict="key").execute()
+            return self.client.table(self.state_table).upsert(rec, on_conflict="key", returning=ReturnMethod.minimal).execute()
+        try:
+            await self.run_sync(_q)
+            return True
+        except Exception as e:
+            log.warning("set_state failed: %r", e)
+            return False
+        finally:
+            if key in ("current_date", "last_checked"):
+                SupaClient._date_sync = None
+
+    async def set_states(self, items: Dict[str, Any]) -> bool:
+        """Upsert several state keys in one request."""
+        recs = [{"key": k, "value": v} for k, v in items.items()]
+        def _q():
+            return self.client.table(self.state_table).upsert(recs, on_conflict="key", returning=ReturnMethod.minimal).execute()
         try:
-            await anyio.to_thread.run_sync(_q)
+            await self.run_sync(_q)
             return True
         except Exception as e:
-            print("[Supa] set_state failed:", repr(e))
+            log.warning("set_states failed: %r", e)
             return False
+        finally:
+            if "current_date" in items or "last_checked" in items:
+                SupaClient._date_sync = None
 
     # -------- events ----------------------------------------------------------
 
-    async def load_events(self) -> List[Dict[str, Any]]:
+    @classmethod
+    def invalidate_events_cache(cls) -> None:
+        cls._events_gen += 1
+        cls._events_cache = None
+
+    async def load_events(self, since: Optional[str] = None, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        All events, or only rows with updated_at >= `since` (ISO timestamp).
+        Full loads are served from the process-wide cache while it is younger
+        than EVENTS_CACHE_TTL; callers get fresh row dicts either way.
+        Concurrent cached loads wait for a single in-flight fetch.
+        """
+        if since is not None or not use_cache:
+            return await self._load_events(since)
+        if SupaClient._events_lock is None:
+            SupaClient._events_lock = anyio.Lock()
+        async with SupaClient._events_lock:
+            cached = SupaClient._events_cache
+            if cached and time.monotonic() - cached[0] < EVENTS_CACHE_TTL:
+                return [dict(r) for r in cached[1]]
+            return await self._load_events(None)
+
+    async def _load_events(self, since: Optional[str]) -> List[Dict[str, Any]]:
+        gen = SupaClient._events_gen
+
         def _q():
+            q = self.client.table(self.events_table).select("*")
+            if since:
+                q = q.gte("updated_at", since)
             return (
-                self.client.table(self.events_table)
-                .select("*")
+                q
                 .order("year", desc=False)
                 .order("month", desc=False)
                 .order("day", desc=False)
                 .execute()
             )
         try:
-            res = await anyio.to_thread.run_sync(_q)
-            return getattr(res, "data", None) or []
+            res = await self.run_sync(_q)
+            rows = getattr(res, "data", None) or []
+            if since is None and gen == SupaClient._events_gen:
+                SupaClient._events_cache = (time.monotonic(), [dict(r) for r in rows])
+            return rows
         except Exception as e:
-            print("[Supa] load_events failed:", repr(e))
+            log.warning("load_events failed: %r", e)
             return []
 
     async def sync_current_date(self, default: HarptosDate) -> Optional[HarptosDate]:
+        """
+        Advance the stored date if needed and return it. A result younger than
+        DATE_SYNC_TTL from the same local day is reused by every session.
+        The app's local date is sent as the RPC's `today`, so the database and
+        the cache (and _auto_tick's midnight wake-up) share one clock.
+        """
+        today = date.today().isoformat()
+        if SupaClient._date_sync_lock is None:
+            SupaClient._date_sync_lock = anyio.Lock()
+        async with SupaClient._date_sync_lock:
+            cached = SupaClient._date_sync
+            if cached and cached[1] == today and time.monotonic() - cached[0] < DATE_SYNC_TTL:
+                return dict(cached[2])  # type: ignore[return-value]
+            synced = await self._sync_current_date(default, today)
+            if synced is not None:
+                SupaClient._date_sync = (time.monotonic(), today, dict(synced))  # type: ignore[arg-type]
+            return synced
+
+    async def _sync_current_date(self, default: HarptosDate, today: str) -> Optional[HarptosDate]:
         payload = {
             "default_year": int(default.get("year", 1492)),
             "default_month": int(default.get("month", 1)),
             "default_day": int(default.get("day", 1)),
+            "today": today,
         }
 
         def _q():
             return self.client.rpc("advance_harptos_date_if_needed", payload).execute()
 
         try:
-            res = await anyio.to_thread.run_sync(_q)
-            data = getattr(res, "data", None)
-            if isinstance(data, list):
-                row = data[0] if data else None
-            else:
-                row = data
-            if isinstance(row, str):
-                try:
-                    row = json.loads(row)
-                except Exception:
-                    row = None
+            res = await self.run_sync(_q)
+            # The function returns jsonb, which PostgREST hands back as an object.
+            row = getattr(res, "data", None)
             if not isinstance(row, dict):
                 return None
             return {
@@ -113,18 +226,54 @@ class SupaClient:
                 "day": int(row.get("day", payload["default_day"])),
             }
         except Exception as e:
-            print("[Supa] sync_current_date failed:", repr(e))
+            log.warning("sync_current_date failed: %r", e)
             return None
 
     def upsert_event(self, rec: Dict[str, Any]) -> None:
-        """Synchronous call (wrap with anyio.to_thread.run_sync in app)."""
+        """Synchronous call (wrap with SupaClient.run_sync in app)."""
         if "id" not in rec or rec["id"] in (None, ""):
             rec["id"] = generate_event_id()
-        self.client.table(self.events_table).upsert(rec, on_conflict="id").execute()
+        try:
+            self.client.table(self.events_table).upsert(rec, on_conflict="id", returning=ReturnMethod.minimal).execute()
+        finally:
+            self.invalidate_events_cache()
+
+    def bulk_upsert_events(self, recs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Synchronous batch upsert (wrap with SupaClient.run_sync in app).
+        Returns one entry per record: None on success, else the error text.
+        Sends up to EVENTS_UPSERT_BATCH rows per request; if a batch is
+        rejected, retries its rows one by one so one bad record does not
+        sink the rest.
+        """
+        for rec in recs:
+            if "id" not in rec or rec["id"] in (None, ""):
+                rec["id"] = generate_event_id()
+        results: List[Optional[str]] = []
+        for start in range(0, len(recs), EVENTS_UPSERT_BATCH):
+            chunk = recs[start:start + EVENTS_UPSERT_BATCH]
+            try:
+                self.client.table(self.events_table).upsert(chunk, on_conflict="id", returning=ReturnMethod.minimal).execute()
+            except Exception as e:
+                log.warning("bulk_upsert_events batch failed, retrying per row: %r", e)
+            else:
+                self.invalidate_events_cache()
+                results.extend([None] * len(chunk))
+                continue
+            for rec in chunk:
+                try:
+                    self.upsert_event(rec)
+                    results.append(None)
+                except Exception as e:
+                    results.append(str(e))
+        return results
 
     def delete_event(self, event_id: str) -> None:
         """Delete a single event by UUID."""
-        self.client.table(self.events_table).delete().eq("id", event_id).execute()
+        try:
+            self.client.table(self.events_table).delete(returning=ReturnMethod.minimal).eq("id", event_id).execute()
+        finally:
+            self.invalidate_events_cache()
 
 
 __all__ = ["SupaClient", "HarptosDate", "generate_event_id"]